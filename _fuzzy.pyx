@@ -0,0 +1,119 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled versions of the letter loops in `FuzzySearcher.filter` and `FuzzySearcher.lessFuzzyFilter`.
+
+`fuzzyScan` runs the same loop over many indexed words at once, without a Python call per candidate.
+It reads the words from the flat `FuzzySearcher.letters` buffer, where word `i` is `letters[offsets[i]:offsets[i + 1]]`.
+It releases the GIL, so separate chunks of candidates can be scanned from several threads at once.
+
+Build in place with `python setup.py build_ext --inplace`. Without it, fuzzySearcher uses its pure Python loops.
+"""
+import numpy as np
+
+
+cdef inline str exactStr(object text):
+    """
+    Returns `text` as an exact `str`, so instances of `str` subclasses are accepted like in the pure Python loops.
+    """
+    if type(text) is str:
+        return <str>text
+    if isinstance(text, str):
+        return str.__str__(text)
+    raise TypeError(f"expected str, got {type(text).__name__}")
+
+
+def subsequenceMatch(object candidate, object searchLetters) -> bool:
+    """
+    Returns whether the letters of `searchLetters` appear in order within `candidate`.
+    """
+    cdef str candidateLetters = exactStr(candidate), searchedLetters = exactStr(searchLetters)
+    cdef Py_ssize_t searchLength = len(searchedLetters)
+    cdef Py_ssize_t uptoInSearchLetters = 0
+    cdef Py_UCS4 letter
+    if searchLength == 0 or len(candidateLetters) < searchLength:
+        return False
+    for letter in candidateLetters:
+        if letter == searchedLetters[uptoInSearchLetters]:
+            uptoInSearchLetters += 1
+            if uptoInSearchLetters == searchLength:
+                return True
+    return False
+
+
+def fuzzyMatch(object candidate, object searchLetters, Py_ssize_t tolerance) -> int:
+    """
+    Returns the greatest run of non-matching letters before each matched letter of `searchLetters` in `candidate`,
+    or -1 when the letters do not all appear in order or a run exceeds `tolerance`.
+    """
+    cdef str candidateLetters = exactStr(candidate), searchedLetters = exactStr(searchLetters)
+    cdef Py_ssize_t searchLength = len(searchedLetters)
+    cdef Py_ssize_t uptoInSearchLetters = 0
+    cdef Py_ssize_t distanceWithNoMatch = 0
+    cdef Py_ssize_t greatestDistanceWithNoMatch = 0
+    cdef Py_UCS4 letter
+    if searchLength == 0 or len(candidateLetters) < searchLength:
+        return -1
+    for letter in candidateLetters:
+        if letter == searchedLetters[uptoInSearchLetters]:
+            distanceWithNoMatch = 0
+            uptoInSearchLetters += 1
+            if uptoInSearchLetters == searchLength:
+                return greatestDistanceWithNoMatch
+        else:
+            distanceWithNoMatch += 1
+            if distanceWithNoMatch > greatestDistanceWithNoMatch:
+                greatestDistanceWithNoMatch = distanceWithNoMatch
+                if distanceWithNoMatch > tolerance:
+                    return -1
+    return -1
+
+
+cdef Py_ssize_t scanWords(const unsigned int[:] letters, const Py_ssize_t[:] offsets, const Py_ssize_t[:] candidates,
+                          const unsigned int[:] searchLetters, Py_ssize_t tolerance,
+                          Py_ssize_t[:] matches, Py_ssize_t[:] gaps) noexcept nogil:
+    cdef Py_ssize_t searchLength = searchLetters.shape[0]
+    cdef Py_ssize_t found = 0
+    cdef Py_ssize_t i, word, position, end, uptoInSearchLetters, distanceWithNoMatch, greatestDistanceWithNoMatch
+    if searchLength == 0:
+        return 0
+    for i in range(candidates.shape[0]):
+        word = candidates[i]
+        position = offsets[word]
+        end = offsets[word + 1]
+        if end - position < searchLength:
+            continue
+        uptoInSearchLetters = 0
+        distanceWithNoMatch = 0
+        greatestDistanceWithNoMatch = 0
+        while position < end:
+            if letters[position] == searchLetters[uptoInSearchLetters]:
+                distanceWithNoMatch = 0
+                uptoInSearchLetters += 1
+                if uptoInSearchLetters == searchLength:
+                    matches[found] = word
+                    gaps[found] = greatestDistanceWithNoMatch
+                    found += 1
+                    break
+            else:
+                distanceWithNoMatch += 1
+                if distanceWithNoMatch > greatestDistanceWithNoMatch:
+                    greatestDistanceWithNoMatch = distanceWithNoMatch
+                    if distanceWithNoMatch > tolerance:
+                        break
+            position += 1
+    return found
+
+
+def fuzzyScan(const unsigned int[:] letters, const Py_ssize_t[:] offsets, const Py_ssize_t[:] candidates,
+              const unsigned int[:] searchLetters, Py_ssize_t tolerance):
+    """
+    Returns the indices in `candidates` of the words that `fuzzyMatch` `searchLetters`, in their original order,
+    along with the greatest mismatch run of each. A `tolerance` of `sys.maxsize` matches like `subsequenceMatch`.
+    """
+    matches = np.empty(candidates.shape[0], dtype=np.intp)
+    gaps = np.empty(candidates.shape[0], dtype=np.intp)
+    cdef Py_ssize_t[:] matchesView = matches, gapsView = gaps
+    cdef Py_ssize_t found
+    with nogil:
+        found = scanWords(letters, offsets, candidates, searchLetters, tolerance, matchesView, gapsView)
+    return matches[:found], gaps[:found]
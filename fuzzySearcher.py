@@ -1,5 +1,81 @@
-from collections import defaultdict, Counter
-from typing import List, Dict, Iterable
+import math
+import os
+import re
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Iterable, Optional, Tuple
+
+import numpy as np
+
+try:
+    from _fuzzy import subsequenceMatch, fuzzyMatch, fuzzyScan
+except ImportError:  # the compiled extension is optional, see setup.py
+    subsequenceMatch = fuzzyMatch = fuzzyScan = None
+
+ALPHABET_SIZE = 26
+PAD_CODE_POINT = 0xFFFFFFFF  # above any unicode code point, so padding never equals a searched letter
+MASK_MIN_LETTERS = 4  # distinct search letters from which `letterMasks` beats comparing `counts` rows
+PARALLEL_MIN_CANDIDATES = 10_000  # candidates from which `_compiledScan` splits the scan across threads
+SCAN_WORKERS = os.cpu_count() or 1
+VECTORIZED_MAX_CELLS = 1 << 20  # padded letters `_vectorizedScan` gathers per chunk of candidates
+CANDIDATE_CACHE_MAX_INDICES = 1 << 20  # candidate indices, plus one per entry, memoized per FuzzySearcher
+
+
+def letterCounts(word: str) -> List[int]:
+    """
+    Counts the occurrences of each lowercase ascii letter in `word`, returned as a list of ALPHABET_SIZE ints.
+    Characters outside 'a'-'z' are not indexed; the filters still compare them exactly.
+    """
+    counts = [0] * ALPHABET_SIZE
+    for letter in word:
+        index = ord(letter) - 97
+        if 0 <= index < ALPHABET_SIZE:
+            counts[index] += 1
+    return counts
+
+
+@lru_cache(maxsize=None)
+def scanPool() -> ThreadPoolExecutor:
+    """
+    The thread pool shared by every `FuzzySearcher._compiledScan`, created on first use.
+    """
+    return ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+
+
+def scanTolerance(tolerance: float) -> int:
+    """
+    Converts a tolerance to the Py_ssize_t taken by the compiled loops, so they accept the same values as the Python ones.
+    Mismatch runs are whole letters, so flooring never changes `run > tolerance`; anything from sys.maxsize up,
+    such as float('inf'), can never be exceeded, and anything at or below -1 rejects every mismatch alike.
+    """
+    if tolerance >= sys.maxsize:
+        return sys.maxsize
+    if tolerance <= -1:
+        return -1
+    return math.floor(tolerance)
+
+
+def codePoints(word: str) -> np.ndarray:
+    """
+    Returns the characters of `word` as a uint32 array of code points, the layout of `FuzzySearcher.letters`.
+    """
+    return np.frombuffer(word.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+
+def letterVector(word: str) -> bytes:
+    """
+    Packs `letterCounts(word)` into ALPHABET_SIZE bytes. Counts above 255 saturate, which only ever widens the candidates.
+    """
+    counts = letterCounts(word)
+    if max(counts) > 255:
+        counts = [min(count, 255) for count in counts]
+    return bytes(counts)
+
 
 class FuzzySearcher:
     """
@@ -9,12 +85,25 @@ class FuzzySearcher:
 
     Attributes:
     -----------
-    highestLetterInWordCount: defaultdict
-        Stores the highest count of each letter among the given words.
-    allWords: defaultdict
-        Maps words by letter and count in the format 'letter-count'. E.g., 'a-2' maps to words with 'a' twice.
-    settings: dict
-        Stores settings like 'tolerance' for fuzzy searching.
+    counts: np.ndarray
+        An (ALPHABET_SIZE, words) uint8 matrix holding each word's `letterVector`, one column per word in `words`.
+        E.g., `counts[0, i]` is the number of 'a's in `words[i]`.
+    lengths: np.ndarray
+        The length of each word in `words`.
+    letterMasks: np.ndarray
+        One uint32 per word in `words`, with bit `ord(letter) - 97` set for every letter it contains.
+    letters: np.ndarray
+        The `codePoints` of all of `words` back to back, read by the candidate scans in `search`.
+    offsets: np.ndarray
+        Where each word starts in `letters`: `words[i]` is `letters[offsets[i]:offsets[i + 1]]`.
+    words: np.ndarray
+        The distinct indexed words, in the order they were first given.
+    bigramIndex: dict
+        Maps every pair of adjacent letters to the sorted indices of the words containing it, as C int arrays.
+        Built by the first search with a tolerance below 1, the only one that uses it, and None until then.
+    tolerance: int or None
+        The longest run of mismatched letters `search` allows before each matched letter, or None for exact matching.
+        Change it by assigning the attribute, e.g. `searcher.tolerance = 2`.
 
     Purpose:
     --------
@@ -23,6 +112,11 @@ class FuzzySearcher:
 
     """
 
+    __slots__ = (
+        'words', 'counts', 'lengths', 'letterMasks', 'letters', 'offsets', 'bigramIndex', 'tolerance',
+        '_candidateCache', '_cachedIndexCount', '_cacheLock',
+    )
+
     def __init__(self, words: List[str]):
         """
         External Doc
@@ -38,19 +132,29 @@ class FuzzySearcher:
         Internal Doc
         ------------
         The constructor processes the list of words by counting letter frequencies and creating a lookup table.
-        Words are stored in `allWords`, and the highest count for each letter is tracked in `highestLetterInWordCount`.
+        Duplicate words are dropped so each word has exactly one column in `counts`.
+        The columns are the concatenated `letterVector`s, so indexing a word costs one pass over its characters.
+        `counts` is stored letter-major, so each letter's counts for all words are one contiguous row.
+        `letters` and `offsets` hold every word in one flat buffer, so the compiled scans need no per-word Python objects.
+        `_candidateCache` memoizes `_getAllSearchCandidates` for `_cachedSearchCandidates`, see there.
         """
-        self.highestLetterInWordCount = defaultdict(int)
-        self.allWords: defaultdict[list[str]] = defaultdict(list)
-        self.settings = {
-            'tolerance': 5,  # Default tolerance for fuzzy searching
-        }
-
-        for word in words:
-            for k, v in Counter(word).items():
-                self.allWords[f"{k}-{v}"].append(word)
-                if v > self.highestLetterInWordCount[k]:
-                    self.highestLetterInWordCount[k] = v
+        uniqueWords = list(dict.fromkeys(words))
+        self.words: np.ndarray = np.array(uniqueWords, dtype=object)
+        self.counts: np.ndarray = np.frombuffer(
+            b"".join(letterVector(word) for word in uniqueWords), dtype=np.uint8
+        ).reshape(-1, ALPHABET_SIZE).T.copy()
+        self.lengths: np.ndarray = np.fromiter(map(len, uniqueWords), dtype=np.intp, count=len(uniqueWords))
+        self.letters: np.ndarray = codePoints("".join(uniqueWords))
+        self.offsets: np.ndarray = np.zeros(len(uniqueWords) + 1, dtype=np.intp)
+        np.cumsum(self.lengths, out=self.offsets[1:])
+        self.letterMasks: np.ndarray = np.bitwise_or.reduce(
+            (self.counts > 0).astype(np.uint32) << np.arange(ALPHABET_SIZE, dtype=np.uint32)[:, None], axis=0
+        )
+        self.bigramIndex: Optional[Dict[str, np.ndarray]] = None
+        self._candidateCache: OrderedDict[Tuple[bytes, int], np.ndarray] = OrderedDict()
+        self._cachedIndexCount = 0
+        self._cacheLock = threading.Lock()
+        self.tolerance: Optional[int] = 5  # Default tolerance for fuzzy searching
 
     def getAllSearchCandidates(self, searchLetters: str) -> Iterable[str]:
         """
@@ -76,20 +180,76 @@ class FuzzySearcher:
         """
         Internal Doc
         ------------
-        Converts `searchLetters` to a letter frequency count using `Counter`.
-        The method iterates over the search letter frequencies and retrieves words from `allWords` that meet or exceed the letter count.
-        Returns a list of words that match the frequency requirements.
+        Converts `searchLetters` to a letter vector using `letterVector` and looks the words up with `_getAllSearchCandidates`,
+        through the `_cachedSearchCandidates` memo shared with `search`.
+        Returns a list of words that match the frequency requirements, in the order of `words`.
+        """
+        if not searchLetters:
+            return []
+        return self.words[self._cachedSearchCandidates(letterVector(searchLetters), len(searchLetters))].tolist()
+
+    def _cachedSearchCandidates(self, searchVec: bytes, searchLength: int) -> np.ndarray:
+        """
+        Internal Doc
+        ------------
+        Memoizes `_getAllSearchCandidates` per letter vector and length in `_candidateCache`, so repeating a search,
+        or searching a reordering of the same letters, skips the candidate selection.
+        The cache is bounded by the indices it holds rather than by its entries, as one entry can span the whole corpus:
+        past CANDIDATE_CACHE_MAX_INDICES the least recently used entries are evicted, and larger results are not kept.
+        The memoized index arrays are shared, so they are made read-only.
+        `_cacheLock` guards the cache and its count, so searches can run from several threads. The candidates are
+        selected outside the lock; when two threads miss on the same key, the first to store its result wins.
         """
-        candidates = defaultdict(int)
-        searchLetterCounter = Counter(searchLetters)
+        key = (searchVec, searchLength)
+        cache = self._candidateCache
+        with self._cacheLock:
+            candidateIndices = cache.get(key)
+            if candidateIndices is not None:
+                cache.move_to_end(key)
+                return candidateIndices
+        candidateIndices = self._getAllSearchCandidates(searchVec, searchLength)
+        entrySize = candidateIndices.size + 1
+        if entrySize > CANDIDATE_CACHE_MAX_INDICES:
+            return candidateIndices
+        candidateIndices.flags.writeable = False
+        with self._cacheLock:
+            cachedIndices = cache.get(key)
+            if cachedIndices is not None:
+                cache.move_to_end(key)
+                return cachedIndices
+            cache[key] = candidateIndices
+            self._cachedIndexCount += entrySize
+            while self._cachedIndexCount > CANDIDATE_CACHE_MAX_INDICES:
+                self._cachedIndexCount -= cache.popitem(last=False)[1].size + 1
+        return candidateIndices
 
-        for key, value in searchLetterCounter.items():
-            for amount in range(value, self.highestLetterInWordCount[key] + 1):
-                letterToWordKey = f"{key}-{amount}"
-                if letterToWordKey in self.allWords:
-                    for word in self.allWords[letterToWordKey]:
-                        candidates[word] += 1
-        return [word for word in candidates if candidates[word] == len(searchLetterCounter)]
+    def _getAllSearchCandidates(self, searchVec: bytes, searchLength: int) -> np.ndarray:
+        """
+        Internal Doc
+        ------------
+        Returns the indices into `words` of the words holding at least `searchVec` of every letter.
+        Words shorter than `searchLength` can never match it and are dropped first using `lengths`.
+        Then only the `counts` rows of the letters in the search are compared, one vectorized comparison per letter.
+        Searches with at least MASK_MIN_LETTERS distinct letters instead drop the words missing any of them with a single
+        AND against `letterMasks`, so only letters searched for more than once still need their row compared.
+        With fewer letters the one-byte row comparisons are cheaper than the uint32 mask test.
+        Characters outside 'a'-'z' only constrain the length, so a search without indexed letters keeps every long enough word.
+        A single indexed letter needs neither: the words containing it are exactly the nonzero entries of its row.
+        """
+        counts = self.counts
+        if searchLength == 1:
+            index = searchVec.find(1)
+            if index >= 0:
+                return np.flatnonzero(counts[index] != 0)
+        mask = self.lengths >= searchLength
+        presentLetters = [index for index, count in enumerate(searchVec) if count]
+        if len(presentLetters) >= MASK_MIN_LETTERS:
+            searchMask = np.uint32(sum(1 << index for index in presentLetters))
+            mask &= (self.letterMasks & searchMask) == searchMask
+            presentLetters = [index for index in presentLetters if searchVec[index] > 1]
+        for index in presentLetters:
+            mask &= counts[index] >= searchVec[index]
+        return np.flatnonzero(mask)
 
     @staticmethod    
     def filter(candidates: Iterable[str], searchLetters: str) -> List[str]:
@@ -115,22 +275,36 @@ class FuzzySearcher:
         Use for exact matching when the order of letters is important.
         """
 
+        """
+        Internal Doc
+        ------------
+        Delegates to `_filter` with the length of `searchLetters`.
+        """
+        return FuzzySearcher._filter(candidates, searchLetters, len(searchLetters))
+
+    @staticmethod
+    def _filter(candidates: Iterable[str], searchLetters: str, searchLength: int) -> List[str]:
         """
         Internal Doc
         ------------
         Iterates over candidate words to match the sequence of `searchLetters` letter by letter.
         A match is considered valid when the letters in `searchLetters` appear in order within the word.
+        Candidates shorter than `searchLength` can never match and are skipped before the letter loop.
+        The bound `append` is hoisted into a local, as this loop runs once per candidate letter.
+        When the `_fuzzy` extension is built, the letter loop runs in `subsequenceMatch` instead.
+        Otherwise it runs in `re`, which is implemented in C: for "thr" the pattern `[^t]*t[^h]*h[^r]*r` is compiled once.
+        Every letter is preceded by the class of anything but itself, so matching from the start never backtracks
+        and takes the same greedy path as the letter loop.
+        An empty `searchLetters` matches nothing, as in `search`.
         """
-        passingCandidates = []
-        for candidate in candidates:
-            uptoInSearchLetters = 0
-            for letter in candidate:
-                if letter == searchLetters[uptoInSearchLetters]:
-                    uptoInSearchLetters += 1
-                    if uptoInSearchLetters == len(searchLetters):
-                        passingCandidates.append(candidate)
-                        break
-        return passingCandidates
+        if not searchLength:
+            return []
+        if subsequenceMatch is not None:
+            return [candidate for candidate in candidates if subsequenceMatch(candidate, searchLetters)]
+        match = re.compile("".join(
+            f"[^{escapedLetter}]*{escapedLetter}" for escapedLetter in map(re.escape, searchLetters)
+        )).match
+        return [candidate for candidate in candidates if len(candidate) >= searchLength and match(candidate)]
 
     @staticmethod    
     def lessFuzzyFilter(candidates: Iterable[str], searchLetters: str, tolerance: int) -> List[str]:
@@ -158,14 +332,58 @@ class FuzzySearcher:
         Use when some deviations in letter order or positioning are acceptable.
         """
 
+        """
+        Internal Doc
+        ------------
+        Delegates to `_lessFuzzyFilter` with the length of `searchLetters`.
+        """
+        return FuzzySearcher._lessFuzzyFilter(candidates, searchLetters, len(searchLetters), tolerance)
+
+    @staticmethod
+    def _lessFuzzyFilter(candidates: Iterable[str], searchLetters: str, searchLength: int, tolerance: int) -> List[str]:
         """
         Internal Doc
         ------------
         Iterates over the candidates and checks for matches with the search letters while tracking mismatches.
         If mismatches exceed the tolerance, the word is skipped. Otherwise, words with the smallest mismatch are returned.
+        Each searched letter is matched at its first occurrence, so a candidate is decided in a single pass over its letters.
+        That greedy choice is what defines a match here: a bit-parallel matcher (Shift-Or and its k-mismatch variants)
+        would look for substrings within an edit distance instead, accepting different words.
+        When the `_fuzzy` extension is built, `fuzzyMatch` returns the greatest mismatch run of each candidate.
+        Otherwise the letter loop runs inline in `_passingCandidates`, which takes the whole iterable so that no call
+        is made per candidate.
+        Passing candidates are collected with their mismatch in one flat list, which a stable sort orders by mismatch.
+        """
+        if not searchLength:
+            return []
+        if fuzzyMatch is not None:
+            compiledTolerance = scanTolerance(tolerance)
+            passingCandidates: List[Tuple[int, str]] = []
+            appendCandidate = passingCandidates.append
+            for candidate in candidates:
+                greatestDistanceWithNoMatch = fuzzyMatch(candidate, searchLetters, compiledTolerance)
+                if greatestDistanceWithNoMatch >= 0:
+                    appendCandidate((greatestDistanceWithNoMatch, candidate))
+        else:
+            passingCandidates = FuzzySearcher._passingCandidates(candidates, searchLetters, searchLength, tolerance)
+        passingCandidates.sort(key=itemgetter(0))
+        return [candidate for _, candidate in passingCandidates]
+
+    @staticmethod
+    def _passingCandidates(candidates: Iterable[str], searchLetters: str, searchLength: int,
+                           tolerance: int) -> List[Tuple[int, str]]:
+        """
+        Internal Doc
+        ------------
+        The pure Python counterpart of the `fuzzyMatch` loop: pairs each candidate whose letters of `searchLetters`
+        all match in order, with no run of non-matching letters above `tolerance`, with its greatest such run.
+        As in `_filter`, short candidates are skipped up front and the per-letter work avoids repeated calls and lookups.
         """
-        passingCandidates: Dict[int, List[str]] = defaultdict(list)
+        passingCandidates: List[Tuple[int, str]] = []
+        appendCandidate = passingCandidates.append
         for candidate in candidates:
+            if len(candidate) < searchLength:
+                continue
             distanceWithNoMatch: int = 0
             uptoInSearchLetters = 0
             greatestDistanceWithNoMatch = 0
@@ -173,19 +391,16 @@ class FuzzySearcher:
                 if letter == searchLetters[uptoInSearchLetters]:
                     distanceWithNoMatch = 0
                     uptoInSearchLetters += 1
-                    if uptoInSearchLetters == len(searchLetters):
-                        passingCandidates[greatestDistanceWithNoMatch].append(candidate)
+                    if uptoInSearchLetters == searchLength:
+                        appendCandidate((greatestDistanceWithNoMatch, candidate))
                         break
                 else:
                     distanceWithNoMatch += 1
-                    greatestDistanceWithNoMatch = max(greatestDistanceWithNoMatch, distanceWithNoMatch)
-                    if distanceWithNoMatch > tolerance:
-                        break
-        
-        results = []
-        for key in sorted(passingCandidates.keys()):
-            results.extend(passingCandidates[key])
-        return results
+                    if distanceWithNoMatch > greatestDistanceWithNoMatch:
+                        greatestDistanceWithNoMatch = distanceWithNoMatch
+                        if distanceWithNoMatch > tolerance:
+                            break
+        return passingCandidates
 
     def search(self, searchLetters: str) -> List[str]:
         """
@@ -205,7 +420,7 @@ class FuzzySearcher:
 
         Purpose:
         --------
-        Wraps around other methods to provide a complete search, applying either exact or fuzzy matching based on settings.
+        Wraps around other methods to provide a complete search, applying either exact or fuzzy matching based on `tolerance`.
         """
 
         """
@@ -213,8 +428,135 @@ class FuzzySearcher:
         ------------
         This method first retrieves candidates using `getAllSearchCandidates`, and then applies either the `filter` or 
         `lessFuzzyFilter` based on the tolerance setting.
+        The letter vector and length of `searchLetters` are computed once here rather than by each step.
+        The candidates are never turned into strings: their indices are filtered straight from `letters`, by
+        `_compiledScan` when the `_fuzzy` extension is built and by `_vectorizedScan` otherwise.
+        A stable sort on the gaps then orders the fuzzy results.
+        With a tolerance below 1 the candidates are first narrowed down further with `_filterByBigrams`.
+        """
+        searchLength = len(searchLetters)
+        if not searchLength:
+            return []
+        candidateIndices = self._cachedSearchCandidates(letterVector(searchLetters), searchLength)
+        if self.tolerance is not None and self.tolerance < 1:
+            candidateIndices = self._filterByBigrams(candidateIndices, searchLetters)
+        scan = self._compiledScan if fuzzyScan is not None else self._vectorizedScan
+        if self.tolerance is None:
+            matches, _ = scan(candidateIndices, codePoints(searchLetters), None)
+            return self.words[matches].tolist()
+        matches, gaps = scan(candidateIndices, codePoints(searchLetters), self.tolerance)
+        return self.words[matches[np.argsort(gaps, kind="stable")]].tolist()
+
+    def _compiledScan(
+        self, candidateIndices: np.ndarray, searchCodePoints: np.ndarray, tolerance: Optional[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Internal Doc
+        ------------
+        Runs `fuzzyScan` over the candidates, with the same contract as `_vectorizedScan`.
+        A `tolerance` of None is passed as `sys.maxsize`, which never cuts a match short, and any other goes through
+        `scanTolerance`.
+        From PARALLEL_MIN_CANDIDATES candidates on, they are split into one chunk per worker of `scanPool`.
+        `fuzzyScan` releases the GIL, so the chunks are scanned in parallel, and joining them in order keeps the result order.
+        Smaller scans finish faster than the chunks could be handed out, so they run on the calling thread.
+        """
+        tolerance = sys.maxsize if tolerance is None else scanTolerance(tolerance)
+        if candidateIndices.size < PARALLEL_MIN_CANDIDATES or SCAN_WORKERS == 1:
+            return fuzzyScan(self.letters, self.offsets, candidateIndices, searchCodePoints, tolerance)
+        results = list(scanPool().map(
+            lambda chunk: fuzzyScan(self.letters, self.offsets, chunk, searchCodePoints, tolerance),
+            np.array_split(candidateIndices, SCAN_WORKERS),
+        ))
+        return np.concatenate([matches for matches, _ in results]), np.concatenate([gaps for _, gaps in results])
+
+    def _filterByBigrams(self, candidateIndices: np.ndarray, searchLetters: str) -> np.ndarray:
+        """
+        Internal Doc
+        ------------
+        Keeps the candidates containing every pair of adjacent letters in `searchLetters`, using `bigramIndex`.
+        This only holds for a tolerance below 1, where each searched letter has to directly follow the previous one.
+        With any larger tolerance a match may skip letters between every searched pair, so it can share no bigram at all.
+        The postings are collected as 4-byte `array('i')`s of word indices rather than lists of Python ints, and numpy
+        reads them without a copy. They are intersected smallest first, stopping as soon as nothing is left.
+        """
+        if self.bigramIndex is None:
+            postings: Dict[str, array] = {}
+            for index, word in enumerate(self.words.tolist()):
+                for bigram in {word[i:i + 2] for i in range(len(word) - 1)}:
+                    posting = postings.get(bigram)
+                    if posting is None:
+                        posting = postings[bigram] = array('i')
+                    posting.append(index)
+            self.bigramIndex = {bigram: np.frombuffer(posting, dtype=np.intc) for bigram, posting in postings.items()}
+        emptyPosting = np.empty(0, dtype=np.intc)
+        searchPostings = sorted(
+            (self.bigramIndex.get(searchLetters[i:i + 2], emptyPosting) for i in range(len(searchLetters) - 1)),
+            key=len,
+        )
+        for posting in searchPostings:
+            if not candidateIndices.size:
+                break
+            candidateIndices = np.intersect1d(candidateIndices, posting, assume_unique=True)
+        return candidateIndices
+
+    def _vectorizedScan(
+        self, candidateIndices: np.ndarray, searchCodePoints: np.ndarray, tolerance: Optional[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Internal Doc
+        ------------
+        The numpy counterpart of `fuzzyScan`, matching like `subsequenceMatch` when `tolerance` is None.
+        Returns the candidate indices that match, in their original order, along with the greatest mismatch run of each.
+        The candidates are scanned by `_scanRows` in groups padded to a common width, so the matrices stay bounded:
+        candidates are banded by length, each band holding lengths within a factor of two of each other,
+        and a band is split into chunks of at most VECTORIZED_MAX_CELLS letters.
+        A long word therefore only widens the rows of words about as long as itself.
+        """
+        candidateLengths = self.lengths[candidateIndices]
+        lengthBands = np.frexp(candidateLengths)[1]
+        keptPositions: List[np.ndarray] = []
+        keptGaps: List[np.ndarray] = []
+        for lengthBand in np.unique(lengthBands):
+            bandPositions = np.flatnonzero(lengthBands == lengthBand)
+            rowsPerChunk = max(1, VECTORIZED_MAX_CELLS // max(1, int(candidateLengths[bandPositions].max())))
+            for start in range(0, bandPositions.size, rowsPerChunk):
+                chunkPositions = bandPositions[start:start + rowsPerChunk]
+                found, gaps = self._scanRows(candidateIndices[chunkPositions], searchCodePoints, tolerance)
+                keptPositions.append(chunkPositions[found])
+                keptGaps.append(gaps)
+        if not keptPositions:
+            return candidateIndices, candidateLengths
+        positions = np.concatenate(keptPositions)
+        order = np.argsort(positions, kind="stable")
+        return candidateIndices[positions[order]], np.concatenate(keptGaps)[order]
+
+    def _scanRows(
+        self, candidateIndices: np.ndarray, searchCodePoints: np.ndarray, tolerance: Optional[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        candidates = self.getAllSearchCandidates(searchLetters)
-        if not "tolerance" in self.settings:
-            return self.filter(candidates, searchLetters)
-        return self.lessFuzzyFilter(candidates, searchLetters, self.settings["tolerance"])
+        Internal Doc
+        ------------
+        Returns the positions in `candidateIndices` of the candidates that match, along with the greatest mismatch run of each.
+        The candidates are gathered from `letters` into one row each, padded to the longest candidate with PAD_CODE_POINT.
+        For each searched letter, every row finds its first occurrence at or after its current position at once,
+        which is the same greedy step the letter loops take. Rows without one, or whose gap exceeds `tolerance`, drop out.
+        """
+        candidateLengths = self.lengths[candidateIndices]
+        columns = np.arange(candidateLengths.max())
+        positions = np.minimum(self.offsets[candidateIndices, None] + columns, self.letters.size - 1)
+        rows = np.where(columns < candidateLengths[:, None], self.letters[positions], PAD_CODE_POINT)
+
+        rowPositions = np.arange(candidateIndices.size)
+        starts = np.zeros(candidateIndices.size, dtype=np.intp)
+        greatestGaps = np.zeros(candidateIndices.size, dtype=np.intp)
+        for searchCodePoint in searchCodePoints:
+            hits = (rows == searchCodePoint) & (columns >= starts[:, None])
+            found = hits.any(axis=1)
+            hitPositions = hits.argmax(axis=1)
+            gaps = hitPositions - starts
+            if tolerance is not None:
+                found &= (gaps == 0) | (gaps <= tolerance)
+            rows, rowPositions = rows[found], rowPositions[found]
+            starts = hitPositions[found] + 1
+            greatestGaps = np.maximum(greatestGaps[found], gaps[found])
+        return rowPositions, greatestGaps
@@ -0,0 +1,11 @@
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+# Builds the optional `_fuzzy` extension used by FuzzySearcher's filters:
+#   python setup.py build_ext --inplace
+setup(
+    name="fuzzt-seatcher",
+    ext_modules=cythonize([
+        Extension("_fuzzy", ["_fuzzy.pyx"], extra_compile_args=["-O3"]),
+    ]),
+)
@@ -1,4 +1,12 @@
+import gc
 import unittest
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+
+import fuzzySearcher
 from fuzzySearcher import FuzzySearcher
 from sampleData import words  # Assuming `words` is defined in `data`
 
@@ -11,6 +19,48 @@ class TestFuzzySearcher(unittest.TestCase):
         candidates = self.fuzzy_searcher.getAllSearchCandidates("there")
         self.assertIn("thermopile", candidates)
 
+    def test_get_all_search_candidates_unindexed_letters(self):
+        candidates = self.fuzzy_searcher.getAllSearchCandidates("Qoh")
+        self.assertIn("Qoheleth", candidates)
+        self.assertNotIn("Shilluk", candidates)
+
+    def test_get_all_search_candidates_skips_short_words(self):
+        fuzzy_searcher = FuzzySearcher(["ab", "a-b", "a-bc"])
+        self.assertEqual(fuzzy_searcher.getAllSearchCandidates("a-b"), ["a-b", "a-bc"])
+
+    def test_search_candidates_are_memoized(self):
+        self.fuzzy_searcher.search("theme")
+        cached = self.fuzzy_searcher._candidateCache[(fuzzySearcher.letterVector("meeth"), 5)]
+        self.assertIs(self.fuzzy_searcher._cachedSearchCandidates(fuzzySearcher.letterVector("meeth"), 5), cached)
+
+    def test_search_candidate_cache_is_bounded(self):
+        with mock.patch.object(fuzzySearcher, "CANDIDATE_CACHE_MAX_INDICES", 300):
+            for searchLetters in ("e", "a", "t", "o", "th"):
+                self.fuzzy_searcher.search(searchLetters)
+        cachedIndices = sum(indices.size + 1 for indices in self.fuzzy_searcher._candidateCache.values())
+        self.assertEqual(cachedIndices, self.fuzzy_searcher._cachedIndexCount)
+        self.assertLessEqual(cachedIndices, 300)
+
+    def test_search_candidate_cache_is_thread_safe(self):
+        searchLetters = ["e", "a", "t", "o", "th", "the", "eat"] * 20
+        with mock.patch.object(fuzzySearcher, "CANDIDATE_CACHE_MAX_INDICES", 1000), ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(self.fuzzy_searcher.search, searchLetters))
+        cachedIndices = sum(indices.size + 1 for indices in self.fuzzy_searcher._candidateCache.values())
+        self.assertEqual(cachedIndices, self.fuzzy_searcher._cachedIndexCount)
+        self.assertLessEqual(cachedIndices, 1000)
+        self.assertEqual(results, [self.fuzzy_searcher.search(letters) for letters in searchLetters])
+
+    def test_searcher_is_freed_without_the_cycle_collector(self):
+        fuzzy_searcher = FuzzySearcher(words)
+        fuzzy_searcher.search("theme")
+        counts = weakref.ref(fuzzy_searcher.counts)
+        gc.disable()
+        try:
+            del fuzzy_searcher
+            self.assertIsNone(counts())
+        finally:
+            gc.enable()
+
     def test_filter(self):
         candidates = ["there", "three", "theme"]
         result = FuzzySearcher.filter(candidates, "thr")
@@ -21,6 +71,90 @@ class TestFuzzySearcher(unittest.TestCase):
         candidates = ["three", "there", "theme", "her"]
         result = FuzzySearcher.lessFuzzyFilter(candidates, "thr", 0)
         self.assertEqual(result, ["three"])
+        self.assertEqual(FuzzySearcher.lessFuzzyFilter(iter(candidates), "thr", 1), ["three", "there"])
+
+    @unittest.skipIf(fuzzySearcher.fuzzyMatch is None, "the _fuzzy extension is not built")
+    def test_compiled_filters_match_python(self):
+        candidates = self.fuzzy_searcher.getAllSearchCandidates("the")
+        compiledExact = FuzzySearcher.filter(candidates, "the")
+        compiledFuzzy = FuzzySearcher.lessFuzzyFilter(candidates, "the", 2)
+        with mock.patch.object(fuzzySearcher, "subsequenceMatch", None), mock.patch.object(fuzzySearcher, "fuzzyMatch", None):
+            self.assertEqual(compiledExact, FuzzySearcher.filter(candidates, "the"))
+            self.assertEqual(compiledFuzzy, FuzzySearcher.lessFuzzyFilter(candidates, "the", 2))
+
+    def test_filters_accept_str_subclasses(self):
+        class Word(str):
+            pass
+
+        candidates = [Word(candidate) for candidate in ("three", "tahr", "hat")]
+        self.assertEqual(FuzzySearcher.filter(candidates, Word("thr")), ["three", "tahr"])
+        self.assertEqual(FuzzySearcher.lessFuzzyFilter(candidates, Word("thr"), 0), ["three"])
+        with self.assertRaises(TypeError):
+            FuzzySearcher.filter([3], "thr")
+
+    @unittest.skipIf(fuzzySearcher.fuzzyScan is None, "the _fuzzy extension is not built")
+    def test_compiled_search_matches_vectorized(self):
+        compiledFuzzy = self.fuzzy_searcher.search("the")
+        self.fuzzy_searcher.tolerance = None
+        compiledExact = self.fuzzy_searcher.search("the")
+        with mock.patch.object(fuzzySearcher, "fuzzyScan", None):
+            self.assertEqual(compiledExact, self.fuzzy_searcher.search("the"))
+            self.fuzzy_searcher.tolerance = 5
+            self.assertEqual(compiledFuzzy, self.fuzzy_searcher.search("the"))
+
+    @unittest.skipIf(fuzzySearcher.fuzzyScan is None, "the _fuzzy extension is not built")
+    def test_parallel_compiled_scan(self):
+        serial = self.fuzzy_searcher.search("e")
+        with mock.patch.object(fuzzySearcher, "PARALLEL_MIN_CANDIDATES", 1), \
+                mock.patch.object(fuzzySearcher, "SCAN_WORKERS", 3):
+            self.assertEqual(serial, self.fuzzy_searcher.search("e"))
+
+    def test_unbounded_tolerances(self):
+        for tolerance in (2 ** 31, 2 ** 70, float("inf")):
+            self.assertEqual(FuzzySearcher.lessFuzzyFilter(["three", "tahr"], "thr", tolerance), ["three", "tahr"])
+            self.fuzzy_searcher.tolerance = tolerance
+            unbounded = self.fuzzy_searcher.search("thr")
+            with mock.patch.object(fuzzySearcher, "fuzzyScan", None):
+                self.assertEqual(unbounded, self.fuzzy_searcher.search("thr"))
+        self.fuzzy_searcher.tolerance = None
+        self.assertEqual(sorted(unbounded), sorted(self.fuzzy_searcher.search("thr")))
+
+    def test_negative_tolerance_keeps_exact_runs(self):
+        fuzzy_searcher = FuzzySearcher(["three", "xthree"])
+        fuzzy_searcher.tolerance = -1
+        self.assertEqual(fuzzy_searcher.search("thr"), ["three"])
+        with mock.patch.object(fuzzySearcher, "fuzzyScan", None):
+            self.assertEqual(fuzzy_searcher.search("thr"), ["three"])
+
+    def test_vectorized_scan(self):
+        fuzzy_searcher = FuzzySearcher(["three", "there", "theme", "her", "tahr"])
+        matches, gaps = fuzzy_searcher._vectorizedScan(np.arange(5), fuzzySearcher.codePoints("thr"), 1)
+        self.assertEqual(fuzzy_searcher.words[matches].tolist(), ["three", "there", "tahr"])
+        self.assertEqual(gaps.tolist(), [0, 1, 1])
+
+    def test_zero_tolerance_search_uses_bigrams(self):
+        self.fuzzy_searcher.tolerance = 0
+        candidates = self.fuzzy_searcher.getAllSearchCandidates("the")
+        self.assertEqual(self.fuzzy_searcher.search("the"), FuzzySearcher.lessFuzzyFilter(candidates, "the", 0))
+        candidateIndices = self.fuzzy_searcher._cachedSearchCandidates(fuzzySearcher.letterVector("the"), 3)
+        pruned = self.fuzzy_searcher._filterByBigrams(candidateIndices, "the")
+        self.assertLess(pruned.size, candidateIndices.size)
+        self.assertNotIn("helotry", self.fuzzy_searcher.words[pruned].tolist())
+        self.assertIn("helotry", candidates)
+
+    def test_vectorized_scan_bounds_long_words(self):
+        longWord = "t" + "x" * 20000 + "he"
+        fuzzy_searcher = FuzzySearcher(words + [longWord, "e" * 20000])
+        with mock.patch.object(fuzzySearcher, "fuzzyScan", None), \
+                mock.patch.object(fuzzySearcher, "VECTORIZED_MAX_CELLS", 4096):
+            result = fuzzy_searcher.search("e")
+            fuzzy_searcher.tolerance = None
+            exact = fuzzy_searcher.search("the")
+        candidates = fuzzy_searcher.getAllSearchCandidates("e")
+        self.assertEqual(result, FuzzySearcher.lessFuzzyFilter(candidates, "e", 5))
+        self.assertIn("e" * 20000, result)
+        self.assertIn(longWord, exact)
+        self.assertEqual(exact, FuzzySearcher.filter(fuzzy_searcher.getAllSearchCandidates("the"), "the"))
 
     def test_search(self):
         result = self.fuzzy_searcher.search("theme")